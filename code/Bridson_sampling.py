@@ -3,50 +3,44 @@
 # Copyright (2017) Nicolas P. Rougier - BSD license
 # More information at https://github.com/rougier/numpy-book
 # -----------------------------------------------------------------------------
+import random
 import numpy as np
 import matplotlib.pyplot as plt
 
 
-def Bridson_sampling(width=1.0, height=1.0, radius=0.025, k=30):
+def Bridson_sampling(width=1.0, height=1.0, radius=0.025, k=30, seed=None):
     # References: Fast Poisson Disk Sampling in Arbitrary Dimensions
     #             Robert Bridson, SIGGRAPH, 2007
-    def squared_distance(p0, p1):
-        return (p0[0]-p1[0])**2 + (p0[1]-p1[1])**2
-
     def random_point_around(p, k=1):
         # WARNING: This is not uniform around p but we can live with it
-        R = np.random.uniform(radius, 2*radius, k)
-        T = np.random.uniform(0, 2*np.pi, k)
-        P = np.empty((k, 2))
-        P[:, 0] = p[0]+R*np.sin(T)
-        P[:, 1] = p[1]+R*np.cos(T)
+        R, T, P = BR[:k], BT[:k], B[:k]
+        rng.random(out=R)
+        R *= radius
+        R += radius
+        rng.random(out=T)
+        T *= 2*np.pi
+        np.sin(T, out=P[:, 0])
+        np.cos(T, out=P[:, 1])
+        P *= R[:, np.newaxis]
+        P += p
         return P
 
-    def in_limits(p):
-        return 0 <= p[0] < width and 0 <= p[1] < height
-
-    def neighborhood(shape, index, n=2):
-        row, col = index
-        row0, row1 = max(row-n, 0), min(row+n+1, shape[0])
-        col0, col1 = max(col-n, 0), min(col+n+1, shape[1])
-        I = np.dstack(np.mgrid[row0:row1, col0:col1])
-        I = I.reshape(I.size//2, 2).tolist()
-        I.remove([row, col])
-        return I
-
-    def in_neighborhood(p):
-        i, j = int(p[0]/cellsize), int(p[1]/cellsize)
+    def in_neighborhood(p, i, j):
         if M[i, j]:
             return True
-        for (i, j) in N[(i, j)]:
-            if M[i, j] and squared_distance(p, P[i, j]) < squared_radius:
-                return True
+        # Scan the (clamped) 5x5 window around (i,j) directly on the grid
+        for ii in range(max(i-2, 0), min(i+3, rows)):
+            for jj in range(max(j-2, 0), min(j+3, cols)):
+                if M[ii, jj]:
+                    dx, dy = p[0]-X[ii, jj], p[1]-Y[ii, jj]
+                    if dx*dx+dy*dy < squared_radius:
+                        return True
         return False
 
     def add_point(p):
         points.append(p)
         i, j = int(p[0]/cellsize), int(p[1]/cellsize)
-        P[i, j], M[i, j] = p, True
+        X[i, j], Y[i, j], M[i, j] = p[0], p[1], True
 
     # Here `2` corresponds to the number of dimension
     cellsize = radius/np.sqrt(2)
@@ -56,27 +50,36 @@ def Bridson_sampling(width=1.0, height=1.0, radius=0.025, k=30):
     # Squared radius because we'll compare squared distance
     squared_radius = radius*radius
 
-    # Positions cells
-    P = np.zeros((rows, cols, 2), dtype=np.float32)
+    # Positions cells (one array per coordinate)
+    X = np.zeros((rows, cols))
+    Y = np.zeros((rows, cols))
     M = np.zeros((rows, cols), dtype=bool)
 
-    # Cache generation for neighborhood
-    N = {}
-    for i in range(rows):
-        for j in range(cols):
-            N[(i, j)] = neighborhood(M.shape, (i, j), 2)
+    # Candidates buffers (reused for each active point)
+    BR, BT, B = np.empty(k), np.empty(k), np.empty((k, 2))
+
+    # Generators (seeded alike): rng fills the buffers above in place,
+    # rand is faster for the scalar draws
+    rng = np.random.default_rng(seed)
+    rand = random.Random(seed)
 
     points = []
-    add_point((np.random.uniform(0,width), np.random.uniform(0,height)))
+    add_point((rand.random()*width, rand.random()*height))
     while len(points):
-        i = np.random.randint(len(points))
+        i = rand.randrange(len(points))
         p = points[i]
-        del points[i]
+        # Order does not matter: swap with last and pop in O(1)
+        points[i] = points[-1]
+        points.pop()
         Q = random_point_around(p, k)
-        for q in Q:
-            if in_limits(q) and not in_neighborhood(q):
+        # Discard out of domain candidates and compute cells all at once
+        Q = Q[(Q[:, 0] >= 0) & (Q[:, 0] < width) &
+              (Q[:, 1] >= 0) & (Q[:, 1] < height)]
+        C = (Q/cellsize).astype(int)
+        for q, (i, j) in zip(Q.tolist(), C.tolist()):
+            if not in_neighborhood(q, i, j):
                 add_point(q)
-    return P[M]
+    return np.stack((X[M], Y[M]), axis=1)
 
 
 if __name__ == '__main__':
@@ -5,10 +5,9 @@
 # -----------------------------------------------------------------------------
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.spatial.distance import cdist
 
 
-def DART_sampling_numpy(width=1.0, height=1.0, radius=0.025, k=100):
+def DART_sampling_numpy(width=1.0, height=1.0, radius=0.025, k=100, seed=None):
 
     # Theoretical limit
     n = int((width+radius)*(height+radius) / (2*(radius/2)*(radius/2)*np.sqrt(3))) + 1
@@ -16,25 +15,41 @@ def DART_sampling_numpy(width=1.0, height=1.0, radius=0.025, k=100):
     n = 5*n
 
     # Compute n random points
-    P = np.zeros((n, 2))
-    P[:, 0] = np.random.uniform(0, width, n)
-    P[:, 1] = np.random.uniform(0, height, n)
+    rng = np.random.default_rng(seed)
+    P = rng.random((n, 2), dtype=np.float32)
+    P *= (width, height)
 
-    # Computes respective distances at once
-    D = cdist(P, P)
+    # Background grid (at most one point per cell) to test nearby points only
+    cellsize = radius/np.sqrt(2)
+    rows = int(np.ceil(width/cellsize))
+    cols = int(np.ceil(height/cellsize))
+    G = np.zeros((rows, cols, 2))
+    M = np.zeros((rows, cols), dtype=bool)
+    squared_radius = radius*radius
 
-    # Cancel null distances on the diagonal
-    D[range(n), range(n)] = 1e10
+    def in_neighborhood(p, i, j):
+        if M[i, j]:
+            return True
+        for ii in range(max(i-2, 0), min(i+3, rows)):
+            for jj in range(max(j-2, 0), min(j+3, cols)):
+                if M[ii, jj]:
+                    dx, dy = p[0]-G[ii, jj, 0], p[1]-G[ii, jj, 1]
+                    if dx*dx+dy*dy < squared_radius:
+                        return True
+        return False
 
-    points, indices = [P[0]], [0]
-    i = 1
+    # Computes respective cells at once
+    C = (P/cellsize).astype(int)
+
+    points = []
     last_success = 0
-    while i < n and i - last_success < k:
-        if D[i, indices].min() > radius:
-            indices.append(i)
+    for i, (p, (row, col)) in enumerate(zip(P.tolist(), C.tolist())):
+        if i - last_success >= k:
+            break
+        if not in_neighborhood(p, row, col):
             points.append(P[i])
+            G[row, col], M[row, col] = p, True
             last_success = i
-        i += 1
     return points
 
 
@@ -9,10 +9,7 @@ import matplotlib.pyplot as plt
 
 
 def DART_sampling_python(width=1.0, height=1.0, radius=0.025, k=100):
-    def squared_distance(p0, p1):
-        dx, dy = p0[0]-p1[0], p0[1]-p1[1]
-        return dx*dx+dy*dy
-
+    squared_radius = radius*radius
     points = []
     i = 0
     last_success = 0
@@ -20,8 +17,9 @@ def DART_sampling_python(width=1.0, height=1.0, radius=0.025, k=100):
         x = random.uniform(0, width)
         y = random.uniform(0, height)
         accept = True
-        for p in points:
-            if squared_distance(p, (x, y)) < radius*radius:
+        for (px, py) in points:
+            dx, dy = px-x, py-y
+            if dx*dx+dy*dy < squared_radius:
                 accept = False
                 break
         if accept is True:
@@ -5,6 +5,7 @@
 # -----------------------------------------------------------------------------
 import numpy as np
 import itertools as it
+from functools import lru_cache
 
 
 def solution_1():
@@ -43,6 +44,14 @@ def solution_3_bis():
             for a in range(11) for b in range(11 - a) for c in range(11 - a - b))
 
 
+@lru_cache(maxsize=1)
+def solution_3_ter():
+    # Memoized intricated iterations (input-free, so computed only once)
+    # 486 iterations on first call, none afterwards, no test
+    # A tuple is returned such that the cached result cannot be modified
+    return tuple(solution_3())
+
+
 def solution_4():
     # Author: Yaser Martinez
     # Numpy indices
@@ -52,6 +61,15 @@ def solution_4():
     return np.vstack((X123, X4)).T[X4 > -1]
 
 
+def solution_5():
+    # Numpy sparse indices
+    # No iterations, 1331 (= 11*11*11) tests on a broadcasted sum,
+    # only the 286 valid tuples are built
+    A, B, C = np.indices((11,11,11), sparse=True)
+    X123 = np.array(np.nonzero(A+B+C <= 10))
+    return np.vstack((X123, 10 - X123.sum(axis=0))).T
+
+
 if __name__ == '__main__':
     from tools import timeit
 
@@ -59,9 +77,11 @@ if __name__ == '__main__':
     timeit("solution_2()", globals())
     timeit("solution_3()", globals())
     timeit("solution_4()", globals())
-    # timeit("solution_5()", globals())
+    timeit("solution_5()", globals())
     print()
     timeit("solution_3_bis()", globals())
+    # Clear the cache at each call, or only the lookup would be timed
+    timeit("solution_3_ter.cache_clear(); solution_3_ter()", globals())
 
     print(type(solution_3()))
     print(type(solution_3_bis()))
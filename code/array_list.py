@@ -31,6 +31,7 @@ Example
 
 """
 import numpy as np
+from itertools import chain
 
 
 class ArrayList(object):
@@ -75,8 +76,8 @@ class ArrayList(object):
         if data is not None:
             if type(data) in [list,tuple]:
                 if type(data[0]) in [list,tuple]:
-                    sizes = [len(l) for l in data]
-                    data = [item for sublist in data for item in sublist]
+                    sizes = list(map(len, data))
+                    data = list(chain.from_iterable(data))
             self._data = np.array(data, copy=False)
             self._size = self._data.size
 
@@ -240,7 +241,7 @@ class ArrayList(object):
         if type(key) is int:
             if key < 0:
                 key += len(self)
-            if key < 0 or key > len(self):
+            if key < 0 or key >= len(self):
                 raise IndexError("List deletion index out of range")
             istart, istop = key, key+1
             dstart,dstop = self._items[key]
@@ -263,19 +264,16 @@ class ArrayList(object):
         else:
             raise TypeError("List deletion indices must be integers")
 
-        # Remove data
-        size = self._size - (dstop-dstart)
-        self._data[dstart:dstart+size] = self._data[dstop:dstop+size]
-        self._size -= dstop-dstart
-
-        # Remove corresponding items
-        size = self._count - istop
-        self._items[istart:istart+size] = self._items[istop:istop+size]
-
-        # Update other items
+        # Remove data (only live data located after the deleted one is moved)
         size = dstop-dstart
-        self._items[istart:istop+size+1] -= size, size
-        self._count -= istop-istart
+        self._data[dstart:self._size-size] = self._data[dstop:self._size]
+        self._size -= size
+
+        # Remove corresponding items and update the ones that have moved
+        count = istop-istart
+        self._items[istart:self._count-count] = self._items[istop:self._count]
+        self._items[istart:self._count-count] -= size
+        self._count -= count
 
 
 
@@ -307,8 +305,8 @@ class ArrayList(object):
             raise RuntimeError("List is not sizeable")
 
         if type(data) in [list,tuple] and type(data[0]) in [list,tuple]:
-            sizes = [len(l) for l in data]
-            data = [item for sublist in data for item in sublist]
+            sizes = list(map(len, data))
+            data = list(chain.from_iterable(data))
 
         data = np.array(data,copy=False).ravel()
         size = data.size
@@ -330,13 +328,17 @@ class ArrayList(object):
 
         # Check if data array is big enough and resize it if necessary
         if self._size + size  >= self._data.size:
-            capacity = int(2**np.ceil(np.log2(self._size + size)))
-            self._data = np.resize(self._data, capacity)
+            capacity = 1 << int(self._size + size - 1).bit_length()
+            buffer = np.empty(capacity, dtype=self._data.dtype)
+            buffer[:self._size] = self._data[:self._size]
+            self._data = buffer
 
         # Check if item array is big enough and resize it if necessary
         if self._count + _count  >= len(self._items):
-            capacity = int(2**np.ceil(np.log2(self._count + _count)))
-            self._items = np.resize(self._items, (capacity, 2))
+            capacity = 1 << int(self._count + _count - 1).bit_length()
+            items = np.empty((capacity, 2), dtype=self._items.dtype)
+            items[:self._count] = self._items[:self._count]
+            self._items = items
         
         # Check index
         if index < 0:
@@ -10,6 +10,15 @@ from matplotlib.animation import FuncAnimation
 from matplotlib.collections import PathCollection
 
 
+def limit(vectors, maximum):
+    """ Limit (in place) the norm of each row of vectors to maximum """
+
+    # Branchless: the tiny epsilon avoids a division by zero for null vectors
+    norm = np.sqrt((vectors*vectors).sum(axis=1, keepdims=True) + 1e-30)
+    vectors *= np.minimum(maximum/norm, 1)
+    return vectors
+
+
 class MarkerCollection:
     """
     Marker collection
@@ -24,7 +33,9 @@ class MarkerCollection:
 
         self._scale = np.ones(n)
         self._translate = np.zeros((n, 2))
-        self._rotate = np.zeros(n)
+        self._rotate = np.zeros(n, dtype=np.float32)
+        self._cos_rotate = np.empty((n, 1), dtype=np.float32)
+        self._sin_rotate = np.empty((n, 1), dtype=np.float32)
 
         self._path = Path(vertices=self._vertices.reshape(n*len(v), 2),
                           codes=self._codes)
@@ -33,15 +44,19 @@ class MarkerCollection:
 
     def update(self):
         n = len(self._base_vertices)
-        self._vertices[...] = self._base_vertices * self._scale
-        cos_rotate, sin_rotate = np.cos(self._rotate), np.sin(self._rotate)
-        R = np.empty((n, 2, 2))
-        R[:, 0, 0] = cos_rotate
-        R[:, 1, 0] = sin_rotate
-        R[:, 0, 1] = -sin_rotate
-        R[:, 1, 1] = cos_rotate
-        self._vertices[...] = np.einsum('ijk,ilk->ijl', self._vertices, R)
-        self._vertices += self._translate.reshape(n, 1, 2)
+        # Scaled rotation, written out as a 2x2 product on base vertices,
+        # plus translation in the same pass (rotation is float32 like the
+        # boid velocities it derives from)
+        rotate = np.reshape(self._rotate, (n, 1))
+        cos_rotate = np.cos(rotate, out=self._cos_rotate)
+        sin_rotate = np.sin(rotate, out=self._sin_rotate)
+        scale = np.reshape(self._scale, (-1, 1))
+        cos_rotate *= scale
+        sin_rotate *= scale
+        translate = np.reshape(self._translate, (n, 1, 2))
+        x, y = self._base_vertices[..., 0], self._base_vertices[..., 1]
+        self._vertices[..., 0] = x*cos_rotate - y*sin_rotate + translate[..., 0]
+        self._vertices[..., 1] = x*sin_rotate + y*cos_rotate + translate[..., 1]
 
 
 class Flock:
@@ -155,6 +170,142 @@ class Flock:
         position %= (self.width, self.height)
 
 
+class TiledFlock(Flock):
+    """
+    Flock whose paired (n, n) arrays are processed in row tiles, using
+    scratch buffers allocated once
+    """
+
+    # Number of rows of the paired (n, n) arrays processed at once: a tile
+    # of paired arrays stays in cache while the full arrays would not
+    tile = 64
+
+    def __init__(self, count=500, width=640, height=360):
+        Flock.__init__(self, count, width, height)
+
+        # Paired (tile, n) arrays, allocated once and reused for each tile
+        shape = min(self.tile, count), count
+        self._dx = np.empty(shape, dtype=np.float32)
+        self._dy = np.empty(shape, dtype=np.float32)
+        self._distance_2 = np.empty(shape, dtype=np.float32)
+        self._weight = np.empty(shape, dtype=np.float32)
+        self._mask_0 = np.empty(shape, dtype=bool)
+        self._mask_1 = np.empty(shape, dtype=bool)
+        self._mask_2 = np.empty(shape, dtype=bool)
+        self._mask = np.empty(shape, dtype=np.float32)
+
+    def run(self):
+        position = self.position
+        velocity = self.velocity
+        min_velocity = self.min_velocity
+        max_velocity = self.max_velocity
+        max_acceleration = self.max_acceleration
+        n = len(position)
+
+        # Contiguous copies of the coordinates rather than strided columns
+        X, Y = position.T.copy()
+        neighbours = np.hstack((velocity, position))
+
+        # Per boid sums over neighbours, accumulated tile after tile
+        repulsion = np.empty((n, 2), dtype=np.float32)
+        target = np.empty((n, 4), dtype=np.float32)
+        mask_1_count = np.empty(n, dtype=np.float32)
+        mask_2_count = np.empty(n, dtype=np.float32)
+
+        for start in range(0, n, self.tile):
+            rows = slice(start, min(start + self.tile, n))
+            k = rows.stop - rows.start
+
+            # Paired differences (float32 like position)
+            dx = np.subtract(X[rows].reshape(k, 1), X, out=self._dx[:k])
+            dy = np.subtract(Y[rows].reshape(k, 1), Y, out=self._dy[:k])
+
+            # Squared distances are enough to test against (squared) radius
+            distance_2 = np.multiply(dx, dx, out=self._distance_2[:k])
+            distance_2 += np.multiply(dy, dy, out=self._weight[:k])
+
+            # Compute common distance masks
+            mask_0 = np.greater(distance_2, 0, out=self._mask_0[:k])
+            mask_1 = np.less(distance_2, 25*25, out=self._mask_1[:k])
+            mask_2 = np.less(distance_2, 50*50, out=self._mask_2[:k])
+            mask_1 *= mask_0
+            mask_2 *= mask_0
+            # Alignment and cohesion masks are only used in dot products:
+            # casting them once to float32 lets both dots go straight to
+            # BLAS (sgemm)
+            self._mask[:k] = mask_2
+            mask_2 = self._mask[:k]
+            mask_1_count[rows] = mask_1.sum(axis=1, dtype=np.float32)
+            mask_2_count[rows] = mask_2.sum(axis=1)
+
+            # Repulsion is inversely proportional to (squared) distance and
+            # only applies to local neighbours (weight is 0 elsewhere)
+            weight = self._weight[:k]
+            weight[...] = 0
+            np.divide(1, distance_2, out=weight, where=mask_1)
+            repulsion[rows, 0] = np.einsum('ij,ij->i', dx, weight)
+            repulsion[rows, 1] = np.einsum('ij,ij->i', dy, weight)
+
+            # Alignment and cohesion targets (sum of velocities and positions
+            # of local neighbours) with a single dot product
+            np.dot(mask_2, neighbours, out=target[rows])
+
+        np.maximum(mask_1_count, 1, out=mask_1_count)
+        np.maximum(mask_2_count, 1, out=mask_2_count)
+
+        # Separation
+        count = mask_1_count
+        steer = repulsion
+        steer /= count.reshape(n, 1)
+        norm = np.sqrt((steer*steer).sum(axis=1)).reshape(n, 1)
+        steer = max_velocity*np.divide(steer, norm, out=steer,
+                                       where=norm != 0)
+        steer -= velocity
+
+        # Limit acceleration
+        limit(steer, max_acceleration)
+
+        separation = steer
+
+        # Alignment & cohesion
+        # ---------------------------------------------------------------------
+        # Both use the same mask: their targets are the average velocity and
+        # gravity center of local neighbours
+        count = mask_2_count
+        target /= count.reshape(n, 1)
+        target = target.reshape(n, 2, 2)
+
+        # Direction toward the gravity center
+        target[:, 1] -= position
+
+        # Compute both steerings at once (at constant speed)
+        norm = np.sqrt((target*target).sum(axis=2)).reshape(n, 2, 1)
+        target = max_velocity * np.divide(target, norm, out=target,
+                                          where=norm != 0)
+        steer = target - velocity.reshape(n, 1, 2)
+
+        # Limit acceleration
+        limit(steer.reshape(2*n, 2), max_acceleration)
+        alignment, cohesion = steer[:, 0], steer[:, 1]
+
+        # ---------------------------------------------------------------------
+        acceleration = 1.5 * separation + alignment + cohesion
+        velocity += acceleration
+
+        # Keep speed within [min_velocity, max_velocity]
+        norm = np.sqrt((velocity*velocity).sum(axis=1, keepdims=True) + 1e-30)
+        velocity *= np.clip(1, min_velocity/norm, max_velocity/norm)
+        position += velocity
+
+        # Wraparound (a boid never moves by more than width or height at
+        # once, so a single addition/subtraction is enough, no modulo).
+        # Add first: a tiny negative position rounds up to exactly size
+        # and the subtraction then brings it back to 0.
+        size = (self.width, self.height)
+        np.add(position, size, out=position, where=position < 0)
+        np.subtract(position, size, out=position, where=position >= size)
+
+
 def update(*args):
     global flock, collection, trace
 
@@ -179,7 +330,7 @@ if __name__ == '__main__':
 
     n = 500
     width, height = 640, 360
-    flock = Flock(n)
+    flock = TiledFlock(n)
     fig = plt.figure(figsize=(10, 10*height/width), facecolor="white")
     ax = fig.add_axes([0.0, 0.0, 1.0, 1.0], aspect=1, frameon=False)
     collection = MarkerCollection(n)
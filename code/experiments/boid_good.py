@@ -38,18 +38,16 @@ MAX_SPEED = 2
 NOISE = 0.3
 # assert REPULSION_LIMIT < ALIGNMENT_LIMIT
 
-# Init boids
-boids = np.zeros(N, dtype=[('pos', float, 2), ('vel', float, 2)])
-boids['pos'] = np.ones((N,2)) * (WORLD_WIDTH/2, WORLD_HEIGHT/2)
-
+# Init boids (one contiguous array per coordinate)
 theta = np.random.uniform(0,2*np.pi, N)
-boids['pos'] = np.ones((N,2))
-boids['pos'][:,0] = np.cos(theta)
-boids['pos'][:,1] = np.sin(theta)
+pos_x = np.cos(theta).astype(np.float32)
+pos_y = np.sin(theta).astype(np.float32)
+vel_x = np.zeros(N, dtype=np.float32)
+vel_y = np.zeros(N, dtype=np.float32)
 
 
 # Use a scatter plot to visualize the boids
-scatter = ax.scatter(boids['pos'][:, 0], boids['pos'][:, 1],
+scatter = ax.scatter(pos_x, pos_y,
                      s=30, facecolor="r", edgecolor="None", alpha=0.75)
 
 
@@ -64,26 +62,22 @@ def update_boids(xs, ys, xvs, yvs, frame):
     xvdiff = np.add.outer(xvs, -xvs)
     yvdiff = np.add.outer(yvs, -yvs)
 
-    # Calculate the boids that are visible to every other boid
-    angle_towards = np.arctan2(-ydiff, -xdiff)
-    angle_vel = np.arctan2(yvs, xvs)
-    angle_diff = angle_towards - angle_vel[:, np.newaxis]
-    visible = 1+0*np.logical_and(angle_diff < np.pi / 2, angle_diff > -np.pi / 2)
+    # All boids are visible to every other boid (no field of view)
 
     # Repulse adjacent boids
-    repulsion = np.clip(1.0 - distance / REPULSION_LIMIT, 0.0, 1.0) * visible
+    repulsion = np.clip(1.0 - distance / REPULSION_LIMIT, 0.0, 1.0)
     repulsion_n = np.maximum(np.add.reduce(repulsion > 0.0).astype(float) - 1, 1)
     yas = -np.sum(xdiff * repulsion, axis=0) * REPULSION_STRENGTH / repulsion_n
     xas = -np.sum(ydiff * repulsion, axis=0) * REPULSION_STRENGTH / repulsion_n
 
     # Align with nearby boids
-    alignment = (distance < ALIGNMENT_LIMIT).astype(float) * visible
+    alignment = (distance < ALIGNMENT_LIMIT)
     alignment_n = np.maximum(np.add.reduce(alignment) - 1, 1)
     xas += np.sum(xvdiff * alignment, axis=0) * ALIGNMENT_STRENGTH / alignment_n
     yas += np.sum(yvdiff * alignment, axis=0) * ALIGNMENT_STRENGTH / alignment_n
 
     # Attraction
-    attraction = (distance < ATTRACTION_LIMIT).astype(float) * visible
+    attraction = (distance < ATTRACTION_LIMIT)
     attraction_n = np.maximum(np.add.reduce(attraction) - 1, 1)
     xas += np.sum(xdiff * attraction, axis=0) * ATTRACTION_STRENGTH / (N - 1)
     yas += np.sum(ydiff * attraction, axis=0) * ATTRACTION_STRENGTH / (N - 1)
@@ -122,13 +116,9 @@ def update_boids(xs, ys, xvs, yvs, frame):
 
 def animate(frame):
 
-    update_boids(boids['pos'][:, 0],
-                 boids['pos'][:, 1],
-                 boids['vel'][:, 0],
-                 boids['vel'][:, 1],
-                 frame)
+    update_boids(pos_x, pos_y, vel_x, vel_y, frame)
 
-    scatter.set_offsets(boids['pos'])
+    scatter.set_offsets(np.column_stack((pos_x, pos_y)))
 
 
 def mouse_move(ev):
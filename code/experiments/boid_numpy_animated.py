@@ -11,8 +11,71 @@ class Flock:
         self.max_acceleration = 0.03
         self.r = 2
         angle = np.random.uniform(0, 2*np.pi, count)
-        self.velocity = np.vstack((np.cos(angle), np.sin(angle))).T
-        self.position = np.random.uniform(-1, 1, (count, 2)) + (width/2, height/2)
+        self.velocity = np.zeros((count, 2), dtype=np.float32)
+        self.velocity[:, 0] = np.cos(angle)
+        self.velocity[:, 1] = np.sin(angle)
+        self.position = np.zeros((count, 2), dtype=np.float32)
+        self.position[...] = np.random.uniform(-1, 1, (count, 2)) + (width/2, height/2)
+
+        # Uniform grid used to find neighbours (cell size is the largest radius)
+        self.cellsize = 50
+        self.cols = int(np.ceil(width/self.cellsize))
+        self.rows = int(np.ceil(height/self.cellsize))
+        self.cells = np.zeros((count, 2), dtype=np.int32)
+        self.counts = np.zeros(self.rows*self.cols, dtype=np.intp)
+        self.offsets = np.zeros(self.rows*self.cols, dtype=np.intp)
+
+        # Scratch buffers, reused from one step to the next
+        self._X = np.zeros(count, dtype=np.float32)
+        self._Y = np.zeros(count, dtype=np.float32)
+        self._capacity = 0
+        self.reserve(count)
+
+    def reserve(self, size):
+        """ Make sure pair buffers can hold at least size pairs """
+
+        if size <= self._capacity:
+            return
+        capacity = self._capacity = 1 << int(size - 1).bit_length()
+        self._dx = np.zeros(capacity, dtype=np.float32)
+        self._dy = np.zeros(capacity, dtype=np.float32)
+        self._distance_2 = np.zeros(capacity, dtype=np.float32)
+        self._tmp = np.zeros(capacity, dtype=np.float32)
+        self._mask_0 = np.zeros(capacity, dtype=bool)
+        self._mask_0_25 = np.zeros(capacity, dtype=bool)
+        self._mask_0_50 = np.zeros(capacity, dtype=bool)
+
+    def neighbours(self):
+        """ Candidate pairs (I, J) of boids lying in neighbouring cells """
+
+        n = len(self.position)
+        rows, cols = self.rows, self.cols
+        cells = self.cells
+
+        # Sort boids by cell (CSR layout: boids of cell c are
+        # indices[offsets[c]:offsets[c]+counts[c]])
+        cells[...] = self.position // self.cellsize
+        np.minimum(cells, (cols-1, rows-1), out=cells)
+        cell = cells[:, 1]*cols + cells[:, 0]
+        indices = np.argsort(cell, kind="stable")
+        self.counts[...] = np.bincount(cell, minlength=rows*cols)
+        np.cumsum(self.counts, out=self.offsets)
+        self.offsets -= self.counts
+
+        # Gather boids from the 3x3 neighbourhood of each boid's cell
+        # (on grids narrower than 3 cells, wrapped offsets would visit the
+        # same cell more than once and count pairs several times)
+        I, J = [], []
+        for oy in ((-1, 0, 1) if rows >= 3 else range(rows)):
+            for ox in ((-1, 0, 1) if cols >= 3 else range(cols)):
+                neighbour = (((cells[:, 1]+oy) % rows)*cols +
+                             ((cells[:, 0]+ox) % cols))
+                count = self.counts[neighbour]
+                start = self.offsets[neighbour] - (np.cumsum(count) - count)
+                k = np.repeat(start, count) + np.arange(count.sum())
+                I.append(np.repeat(np.arange(n), count))
+                J.append(indices[k])
+        return np.concatenate(I), np.concatenate(J)
 
     def run(self):
         position = self.position
@@ -21,44 +84,58 @@ class Flock:
         max_acceleration = self.max_acceleration
         n = len(position)
 
-        dx = np.subtract.outer(position[:, 0], position[:, 0])
-        dy = np.subtract.outer(position[:, 1], position[:, 1])
-        distance = np.hypot(dx, dy)
-
-        # Compute common distance masks
-        mask_0 = (distance > 0)
-        mask_25 = (distance < 20)
-        mask_50 = (distance < 50)
-        mask_0_25 = mask_0 * mask_25
-        mask_0_50 = mask_0 * mask_50
-        mask_0_25_count = np.maximum(mask_0_25.sum(axis=1), 1)
-        mask_0_50_count = np.maximum(mask_0_50.sum(axis=1), 1)
+        # Only pairs from neighbouring cells can be closer than 50
+        I, J = self.neighbours()
+        m = len(I)
+        self.reserve(m)
+        X, Y = self._X, self._Y
+        X[...], Y[...] = position.T
+        dx, dy, tmp = self._dx[:m], self._dy[:m], self._tmp[:m]
+        np.take(X, I, out=dx, mode="clip")
+        dx -= np.take(X, J, out=tmp, mode="clip")
+        np.take(Y, I, out=dy, mode="clip")
+        dy -= np.take(Y, J, out=tmp, mode="clip")
+        distance_2 = np.multiply(dx, dx, out=self._distance_2[:m])
+        distance_2 += np.multiply(dy, dy, out=tmp)
+
+        # Compute common distance masks (on squared distances)
+        mask_0 = np.greater(distance_2, 0, out=self._mask_0[:m])
+        mask_0_25 = np.less(distance_2, 20*20, out=self._mask_0_25[:m])
+        mask_0_25 &= mask_0
+        mask_0_50 = np.less(distance_2, 50*50, out=self._mask_0_50[:m])
+        mask_0_50 &= mask_0
+        I_25, I_50, J_50 = I[mask_0_25], I[mask_0_50], J[mask_0_50]
+        mask_0_25_count = np.maximum(np.bincount(I_25, minlength=n), 1)
+        mask_0_50_count = np.maximum(np.bincount(I_50, minlength=n), 1)
 
         # Separation
         # -----------------------------------------------------------------------------
         # Compute target
-        mask, count = mask_0_25, mask_0_25_count
-        target = np.dstack((dx, dy))
-        target = np.divide(target, distance.reshape(n, n, 1)**2, out=target,
-                           where=distance.reshape(n, n, 1) != 0)
+        count = mask_0_25_count
+        weight = 1/distance_2[mask_0_25]
+        target = np.column_stack((
+            np.bincount(I_25, dx[mask_0_25]*weight, minlength=n),
+            np.bincount(I_25, dy[mask_0_25]*weight, minlength=n)))
 
         # Compute steering
-        steer = (target*mask.reshape(n, n, 1)).sum(axis=1)/count.reshape(n, 1)
+        steer = target/count.reshape(n, 1)
         norm_1 = np.sqrt((steer*steer).sum(axis=1)).reshape(n, 1)
         steer = max_velocity * np.divide(steer, norm_1, out=steer, where=norm_1 != 0)
         steer -= velocity
 
         # Limit acceleration
-        norm_1 = np.sqrt((steer*steer).sum(axis=1)).reshape(n, 1)
-        norm_2 = np.minimum(norm_1, max_acceleration)
-        steer = np.multiply(steer, norm_2/norm_1, out=steer, where=norm_1 != 0)
+        scale = max_acceleration / np.sqrt((steer*steer).sum(axis=1, keepdims=True) + 1e-30)
+        steer *= np.minimum(scale, 1)
         separation = steer
 
         # Alignment
         # -----------------------------------------------------------------------------
         # Compute target
-        mask, count = mask_0_50, mask_0_50_count
-        target = np.dot(mask, velocity)/count.reshape(n, 1)
+        count = mask_0_50_count
+        target = np.column_stack((
+            np.bincount(I_50, velocity[J_50, 0], minlength=n),
+            np.bincount(I_50, velocity[J_50, 1], minlength=n)))
+        target = target/count.reshape(n, 1)
 
         # Compute steering
         norm = np.sqrt((target*target).sum(axis=1)).reshape(n, 1)
@@ -66,16 +143,18 @@ class Flock:
         steer = target - velocity
 
         # Limit acceleration
-        norm_1 = np.sqrt((steer*steer).sum(axis=1)).reshape(n, 1)
-        norm_2 = np.minimum(norm_1, max_acceleration)
-        steer = np.multiply(steer, norm_2/norm_1, out=steer, where=norm_1 != 0)
+        scale = max_acceleration / np.sqrt((steer*steer).sum(axis=1, keepdims=True) + 1e-30)
+        steer *= np.minimum(scale, 1)
         alignment = steer
 
         # Cohesion
         # -----------------------------------------------------------------------------
         # Compute target
-        mask, count = mask_0_50, mask_0_50_count
-        target = np.dot(mask, position)/count.reshape(n, 1)
+        count = mask_0_50_count
+        target = np.column_stack((
+            np.bincount(I_50, position[J_50, 0], minlength=n),
+            np.bincount(I_50, position[J_50, 1], minlength=n)))
+        target = target/count.reshape(n, 1)
 
         # Compute steering
         desired = target - position
@@ -84,17 +163,15 @@ class Flock:
         steer = desired - velocity
 
         # Limit acceleration
-        norm_1 = np.sqrt((steer*steer).sum(axis=1)).reshape(n, 1)
-        norm_2 = np.minimum(norm_1, max_acceleration)
-        steer = np.multiply(steer, norm_2/norm_1, out=steer, where=norm_1 != 0)
+        scale = max_acceleration / np.sqrt((steer*steer).sum(axis=1, keepdims=True) + 1e-30)
+        steer *= np.minimum(scale, 1)
         cohesion = steer
 
         # -----------------------------------------------------------------------------
         acceleration = 1.5 * separation + alignment + cohesion
         velocity += acceleration
-        norm_1 = np.sqrt((velocity*velocity).sum(axis=1)).reshape(n, 1)
-        norm_2 = np.minimum(norm_1, max_velocity)
-        velocity = np.multiply(velocity, norm_2/norm_1, out=velocity, where=norm_1 != 0)
+        scale = max_velocity / np.sqrt((velocity*velocity).sum(axis=1, keepdims=True) + 1e-30)
+        velocity *= np.minimum(scale, 1)
         position += velocity
         
         # Wraparound
@@ -33,13 +33,12 @@ MAX_SPEED = WORLD_WIDTH / 160
 NOISE = 0.1
 assert REPULSION_LIMIT < ALIGNMENT_LIMIT
 
-# Init boids
-boids = np.zeros(N, dtype=[('pos', float, 2), ('vel', float, 2)])
-boids['pos'] = np.random.uniform(WORLD_WIDTH * 0.1, WORLD_WIDTH * 0.9, (N, 2))
-boids['vel'] = np.random.uniform(-WORLD_WIDTH / 200, WORLD_WIDTH / 200, (N, 2))
+# Init boids (one contiguous array per coordinate)
+pos_x, pos_y = np.random.uniform(WORLD_WIDTH * 0.1, WORLD_WIDTH * 0.9, (2, N)).astype(np.float32)
+vel_x, vel_y = np.random.uniform(-WORLD_WIDTH / 200, WORLD_WIDTH / 200, (2, N)).astype(np.float32)
 
 # Use a scatter plot to visualize the boids
-scatter = ax.scatter(boids['pos'][:, 0], boids['pos'][:, 1],
+scatter = ax.scatter(pos_x, pos_y,
                      s=30, facecolor="r", edgecolor="None", alpha=0.75)
 
 
@@ -54,11 +53,9 @@ def update_boids(xs, ys, xvs, yvs, frame):
     xvdiff = np.add.outer(xvs, -xvs)
     yvdiff = np.add.outer(yvs, -yvs)
 
-    # Calculate the boids that are visible to every other boid
-    angle_towards = np.arctan2(-ydiff, -xdiff)
-    angle_vel = np.arctan2(yvs, xvs)
-    angle_diff = angle_towards - angle_vel[:, np.newaxis]
-    visible = np.logical_and(angle_diff < np.pi / 2, angle_diff > -np.pi / 2)
+    # Calculate the boids that are visible to every other boid, i.e. in front
+    # of it: the direction towards them makes an acute angle with its velocity
+    visible = (-xdiff * xvs[:, np.newaxis] - ydiff * yvs[:, np.newaxis]) > 0
 
     # Repulse adjacent boids
     repulsion = np.clip(1.0 - distance / REPULSION_LIMIT, 0.0, 1.0) * visible
@@ -68,7 +65,7 @@ def update_boids(xs, ys, xvs, yvs, frame):
     xvs += -np.sum(ydiff * repulsion, axis=0) * REPULSION_STRENGTH / repulsion_n
 
     # Align with nearby boids
-    alignment = (distance < ALIGNMENT_LIMIT).astype(float) * visible
+    alignment = (distance < ALIGNMENT_LIMIT) & visible
     alignment_n = np.maximum(np.add.reduce(alignment) - 1, 1)
     xvs += np.sum(xvdiff * alignment, axis=0) * ALIGNMENT_STRENGTH / alignment_n
     yvs += np.sum(yvdiff * alignment, axis=0) * ALIGNMENT_STRENGTH / alignment_n
@@ -102,13 +99,9 @@ def update_boids(xs, ys, xvs, yvs, frame):
 
 def animate(frame):
 
-    update_boids(boids['pos'][:, 0],
-                 boids['pos'][:, 1],
-                 boids['vel'][:, 0],
-                 boids['vel'][:, 1],
-                 frame)
+    update_boids(pos_x, pos_y, vel_x, vel_y, frame)
 
-    scatter.set_offsets(boids['pos'])
+    scatter.set_offsets(np.column_stack((pos_x, pos_y)))
 
 
 def mouse_move(ev):
@@ -11,13 +11,11 @@ from matplotlib.animation import FuncAnimation
 
 def update(frame_number):
 
-    P = boids['position']
-    Px = boids['position'][:, 0]
-    Py = boids['position'][:, 1]
+    P = position.T
+    Px, Py = position
 
-    V = boids['velocity']
-    Vx = boids['velocity'][:, 0]
-    Vy = boids['velocity'][:, 1]
+    V = velocity.T
+    Vx, Vy = velocity
 
     # Mask that cancel out diagonal
     # M = (1-np.diag(np.ones(len(P))))
@@ -74,7 +72,7 @@ def update(frame_number):
     # V[...] = np.clip(V * 0.8 , -0.1, 0.1)
 
     P += dt*V
-    scatter.set_offsets(boids['position'])
+    scatter.set_offsets(P)
 
     """
     dt = 0.1
@@ -130,15 +128,16 @@ xmin, xmax = -1.0, +1.0
 ymin, ymax = -1.0, +1.0
 
 
-boids = np.zeros(n, [('position', 'f4', 2),
-                     ('velocity', 'f4', 2)])
-boids['position'] = 0.2*np.random.uniform(-1.00, +1.00, (n, 2))
-boids['velocity'] = 0.0*np.random.uniform(-0.10, +0.10, (n, 2))
+# Coordinates are stored as rows (x, y) so that Px, Py, Vx and Vy are contiguous
+position = np.zeros((2, n), 'f4')
+velocity = np.zeros((2, n), 'f4')
+position.T[...] = 0.2*np.random.uniform(-1.00, +1.00, (n, 2))
+velocity.T[...] = 0.0*np.random.uniform(-0.10, +0.10, (n, 2))
 
 
 fig = plt.figure(figsize=(8, 8))
 ax = fig.add_axes([0.0, 0.0, 1.0, 1.0], frameon=True, aspect=1)
-scatter = ax.scatter(boids["position"][:, 0], boids["position"][:, 1],
+scatter = ax.scatter(position[0], position[1],
                      s=10, facecolor="red", edgecolor="None", alpha=0.5)
 ax.set_xlim(-1, 1)
 ax.set_ylim(-1, 1)
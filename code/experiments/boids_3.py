@@ -11,8 +11,7 @@ import math
 import numpy as np
 import matplotlib.pyplot as plt 
 import matplotlib.animation as animation
-from scipy.spatial.distance import squareform, pdist, cdist
-from numpy.linalg import norm
+from scipy.spatial.distance import squareform, pdist
 
 width, height = 640, 480
 
@@ -22,9 +21,10 @@ class Boids:
         """ initialize the Boid simulation"""
         # init position & velocities
         self.pos = [width/2.0, height/2.0] + 10*np.random.rand(2*N).reshape(N, 2)
+        self.pos = self.pos.astype(np.float32)
         # normalized random velocities
         angles = 2*math.pi*np.random.rand(N)
-        self.vel = np.array(list(zip(np.sin(angles), np.cos(angles))))
+        self.vel = np.array(list(zip(np.sin(angles), np.cos(angles))), dtype=np.float32)
         self.N = N
         # min dist of approach
         self.minDist = 25.0
@@ -35,8 +35,8 @@ class Boids:
 
     def tick(self, frameNum, pts, beak):
         """Update the simulation by one time step."""
-        # get pairwise distances
-        self.distMatrix = squareform(pdist(self.pos))
+        # get pairwise squared distances
+        self.distMatrix = squareform(pdist(self.pos, 'sqeuclidean'))
         # apply rules:
         self.vel += self.applyRules()
         self.limit(self.vel, self.maxVel)
@@ -49,46 +49,40 @@ class Boids:
         beak.set_data(vec.reshape(2*self.N)[::2], 
                       vec.reshape(2*self.N)[1::2])
 
-    def limitVec(self, vec, maxVal):
-        """limit magnitide of 2D vector"""
-        mag = norm(vec)
-        if mag > maxVal:
-            vec[0], vec[1] = vec[0]*maxVal/mag, vec[1]*maxVal/mag
-    
     def limit(self, X, maxVal):
         """limit magnitide of 2D vectors in array X to maxValue"""
-        for vec in X:
-            self.limitVec(vec, maxVal)
+        mag = np.sqrt((X*X).sum(axis=1)).reshape(len(X), 1)
+        scale = np.divide(maxVal, mag, out=np.ones_like(mag), where=mag > maxVal)
+        X *= scale
             
     def applyBC(self):
         """apply boundary conditions"""
         deltaR = 2.0
-        for coord in self.pos:
-            if coord[0] > width + deltaR:
-                coord[0] = - deltaR
-            if coord[0] < - deltaR:
-                coord[0] = width + deltaR    
-            if coord[1] > height + deltaR:
-                coord[1] = - deltaR
-            if coord[1] < - deltaR:
-                coord[1] = height + deltaR
+        x, y = self.pos[:, 0], self.pos[:, 1]
+        x[x > width + deltaR] = - deltaR
+        x[x < - deltaR] = width + deltaR
+        y[y > height + deltaR] = - deltaR
+        y[y < - deltaR] = height + deltaR
     
     def applyRules(self):
         # apply rule #1 - Separation
-        D = self.distMatrix < 25.0
+        D = self.distMatrix < 25.0*25.0
         vel = self.pos*D.sum(axis=1).reshape(self.N, 1) - D.dot(self.pos)
         self.limit(vel, self.maxRuleVel)
 
         # different distance threshold
-        D = self.distMatrix < 50.0
+        D = self.distMatrix < 50.0*50.0
+
+        # sum of neighbours velocities and positions in a single product
+        S = D.dot(np.hstack((self.vel, self.pos)))
 
         # apply rule #2 - Alignment
-        vel2 = D.dot(self.vel)
+        vel2 = S[:, :2]
         self.limit(vel2, self.maxRuleVel)
         vel += vel2;
 
         # apply rule #1 - Cohesion
-        vel3 = D.dot(self.pos) - self.pos
+        vel3 = S[:, 2:] - self.pos
         self.limit(vel3, self.maxRuleVel)
         vel += vel3
 
@@ -99,11 +93,11 @@ class Boids:
         # left click - add a boid
         if event.button is 1:
             self.pos = np.concatenate((self.pos, 
-                                       np.array([[event.xdata, event.ydata]])), 
+                                       np.array([[event.xdata, event.ydata]], dtype=np.float32)), 
                                       axis=0)
             # random velocity
             angles = 2*math.pi*np.random.rand(1)
-            v = np.array(list(zip(np.sin(angles), np.cos(angles))))
+            v = np.array(list(zip(np.sin(angles), np.cos(angles))), dtype=np.float32)
             self.vel = np.concatenate((self.vel, v), axis=0)
             self.N += 1 
         # right click - scatter
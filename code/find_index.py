@@ -19,41 +19,24 @@ def find_index(base, view):
     itemsize = view.itemsize
     offset_start = (np.byte_bounds(view)[0] - np.byte_bounds(base)[0])//itemsize
     offset_stop = (np.byte_bounds(view)[-1] - np.byte_bounds(base)[-1]-1)//itemsize
-    index_start = np.unravel_index(offset_start, base.shape)
-    index_stop = np.unravel_index(base.size+offset_stop, base.shape)
-    index_step  = np.array(view.strides)//np.array(base.strides)
+    lower = np.array(np.unravel_index(offset_start, base.shape))
+    upper = np.array(np.unravel_index(base.size+offset_stop, base.shape))
+    shape = np.array(base.shape)
+    step = np.array(view.strides)//np.array(base.strides)
 
-    index = ""
-    for i in range(len(index_step)):
-        start = index_start[i]
-        stop = index_stop[i]
-        step = index_step[i]
+    # Slices go from upper to lower bound when step is negative
+    start = np.where(step > 0, lower, upper)
+    stop = np.where(step > 0, upper + 1, lower - 1)
 
-        if stop == start:
-            stop, step = None, None
-        else:
-            if stop == base.shape[i] - 1:
-                stop = None
-            else:
-                stop = stop
-            if start == 0:
-                start = None
-        if step is not None and stop is not None:
-            if step < 0:
-                start, stop = stop, start - 1
-            else:
-                start, stop = start, stop + 1
-            
-        if start is not None:
-            index += str(start)
-        if stop is not None:
-            index += ":" + str(stop)
-        elif step is not None:
-            index += ":"
-        if step is not None:
-            index += ":" + str(step)
-        index += ','
-    index = index[:-1]
+    # Bounds at the ends of the base array can be omitted
+    no_start = np.where(step > 0, lower == 0, upper == shape - 1)
+    no_stop = np.where(step > 0, upper == shape - 1, lower == 0)
+
+    # A single index along an axis (lower == upper) is written as is
+    index = ",".join(
+        str(lower[i]) if lower[i] == upper[i] else "%s:%s:%d" % (
+            "" if no_start[i] else start[i], "" if no_stop[i] else stop[i], step[i])
+        for i in range(len(step)))
 
     return index
 
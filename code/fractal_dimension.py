@@ -7,19 +7,23 @@ import numpy as np
 
 
 def fractal_dimension(Z, threshold=0.9):
-    def boxcount(Z, k):
-        S = np.add.reduceat(
+    def boxsum(Z, k):
+        return np.add.reduceat(
             np.add.reduceat(Z, np.arange(0, Z.shape[0], k), axis=0),
                                np.arange(0, Z.shape[1], k), axis=1)
-        return len(np.where((S > 0) & (S < k*k))[0])
     Z = (Z < threshold)
     p = min(Z.shape)
     n = 2**np.floor(np.log(p)/np.log(2))
     n = int(np.log(n)/np.log(2))
     sizes = 2**np.arange(n, 1, -1)
+
+    # Box sums at the smallest size, each larger size sums 2x2 boxes of
+    # the previous one (instead of reading Z again)
+    S = boxsum(Z, sizes[-1])
     counts = []
-    for size in sizes:
-        counts.append(boxcount(Z, size))
+    for size in sizes[::-1]:
+        counts.insert(0, len(np.where((S > 0) & (S < size*size))[0]))
+        S = boxsum(S, 2)
     coeffs = np.polyfit(np.log(sizes), np.log(counts), 1)
     return -coeffs[0]
 
@@ -44,16 +48,16 @@ if __name__ == '__main__':
                   extent=[xmin, xmax, ymin, ymax], origin="upper")
         ax.set_xticks([])
         ax.set_yticks([])
-        for y in range(Z.shape[0]//size+1):
-            for x in range(Z.shape[1]//size+1):
-                s = (Z[y*size:(y+1)*size, x*size:(x+1)*size] > 0.25).sum()
-                if s > 0 and s < size*size:
-                    rect = patches.Rectangle(
-                        (x*size, Z.shape[0]-1-(y+1)*size),
-                        width=size, height=size,
-                        linewidth=.5, edgecolor='.25',
-                        facecolor='.75', alpha=.5)
-                    ax.add_patch(rect)
+        S = np.add.reduceat(
+            np.add.reduceat(Z > 0.25, np.arange(0, Z.shape[0], size), axis=0),
+                                      np.arange(0, Z.shape[1], size), axis=1)
+        for y, x in zip(*np.nonzero((S > 0) & (S < size*size))):
+            rect = patches.Rectangle(
+                (x*size, Z.shape[0]-1-(y+1)*size),
+                width=size, height=size,
+                linewidth=.5, edgecolor='.25',
+                facecolor='.75', alpha=.5)
+            ax.add_patch(rect)
 
     plt.tight_layout()
     plt.savefig("fractal-dimension.png")
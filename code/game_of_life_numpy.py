@@ -14,22 +14,23 @@ def update(*args):
     N = (Z[0:-2, 0:-2] + Z[0:-2, 1:-1] + Z[0:-2, 2:] +
          Z[1:-1, 0:-2]                 + Z[1:-1, 2:] +
          Z[2:  , 0:-2] + Z[2:  , 1:-1] + Z[2:  , 2:])
-    birth = (N == 3) & (Z[1:-1, 1:-1] == 0)
-    survive = ((N == 2) | (N == 3)) & (Z[1:-1, 1:-1] == 1)
-    Z[...] = 0
-    Z[1:-1, 1:-1][birth | survive] = 1
+    # A cell is alive next step if it has 3 neighbours (birth or survival)
+    # or if it is alive and has 2 neighbours (survival)
+    Z[1:-1, 1:-1] = (N == 3) | ((N == 2) & (Z[1:-1, 1:-1] == 1))
+    Z[0, :] = Z[-1, :] = Z[:, 0] = Z[:, -1] = 0
 
-    # Show past activities
-    M[M>0.25] = 0.25
+    # Show past activities (M < 1 after decay, so the maximum sets live cells to 1)
+    np.minimum(M, 0.25, out=M)
     M *= 0.995
-    M[Z==1] = 1
+    np.maximum(M, Z, out=M)
     # Direct activity
     # M[...] = Z
     im.set_data(M)
 
 
-Z = np.random.randint(0, 2, (300, 600))
-M = np.zeros(Z.shape)
+# Cells and neighbour counts (at most 8) fit in uint8
+Z = np.random.randint(0, 2, (300, 600), dtype=np.uint8)
+M = np.zeros(Z.shape, dtype=np.float32)
 
 size = np.array(Z.shape)
 dpi = 80.0
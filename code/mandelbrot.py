@@ -5,38 +5,53 @@
 # -----------------------------------------------------------------------------
 import numpy as np
 
-def mandelbrot(xmin, xmax, ymin, ymax, xn, yn, itermax, horizon=2.0):
-    # Adapted from
-    # https://thesamovar.wordpress.com/2009/03/22/fast-fractals-with-python-and-numpy/
-    Xi, Yi = np.mgrid[0:xn, 0:yn]
-    Xi, Yi = Xi.astype(np.uint32), Yi.astype(np.uint32)
-    X = np.linspace(xmin, xmax, xn, dtype=np.float32)[Xi]
-    Y = np.linspace(ymin, ymax, yn, dtype=np.float32)[Yi]
-    C = X + Y*1j
-    N_ = np.zeros(C.shape, dtype=np.uint32)
-    Z_ = np.zeros(C.shape, dtype=np.complex64)
-    Xi.shape = Yi.shape = C.shape = xn*yn
-    
+def mandelbrot_band(C, Z_, N_, itermax, horizon):
+    # Iterate (flat) points C, storing escape value and iteration in Z_, N_
+    # (Flat) output index of the points still being computed
+    K = np.arange(C.size)
+
     Z = np.zeros(C.shape, np.complex64)
+    # Points that have not diverged yet, updated in place, and buffers
+    I = np.ones(C.shape, dtype=bool)
+    D = np.empty(C.shape, dtype=bool)
+    A = np.empty(C.shape, dtype=np.float32)
     for i in range(itermax):
-        if not len(Z): break
+        # Drop diverged points every few iterations only (compaction copies
+        # all arrays and costs more than masked operations in between)
+        if i and i % 16 == 0:
+            Z, C, K = Z[I], C[I], K[I]
+            if not len(Z): break
+            I = np.ones(Z.shape, dtype=bool)
+            D, A = D[:len(Z)], A[:len(Z)]
 
         # Compute for relevant points only
-        np.multiply(Z, Z, Z)
-        np.add(Z, C, Z)
+        np.multiply(Z, Z, out=Z, where=I)
+        np.add(Z, C, out=Z, where=I)
 
         # Failed convergence
-        I = abs(Z) > horizon
-        N_[Xi[I], Yi[I]] = i+1
-        Z_[Xi[I], Yi[I]] = Z[I]
+        np.greater(np.abs(Z, out=A), horizon, out=D)
+        D &= I
+        N_[K[D]] = i+1
+        Z_[K[D]] = Z[D]
 
         # Keep going with those who have not diverged yet
-        np.negative(I,I)
-        Z = Z[I]
-        Xi, Yi = Xi[I], Yi[I]
-        C = C[I]
-    return Z_.T, N_.T
+        I &= ~D
+
+def mandelbrot(xmin, xmax, ymin, ymax, xn, yn, itermax, horizon=2.0, rows=64):
+    # Adapted from
+    # https://thesamovar.wordpress.com/2009/03/22/fast-fractals-with-python-and-numpy/
+    X = np.linspace(xmin, xmax, xn, dtype=np.float32)
+    Y = np.linspace(ymin, ymax, yn, dtype=np.float32)
+    C = X + Y[:, None]*1j
+    N_ = np.zeros(C.shape, dtype=np.uint32)
+    Z_ = np.zeros(C.shape, dtype=np.complex64)
 
+    # Bands of rows are iterated to completion one after the other such that
+    # their arrays stay in cache for all the iterations
+    for j in range(0, yn, rows):
+        mandelbrot_band(C[j:j+rows].ravel(), Z_[j:j+rows].ravel(),
+                        N_[j:j+rows].ravel(), itermax, horizon)
+    return Z_, N_
 
 if __name__ == '__main__':
     from matplotlib import colors
@@ -56,12 +71,13 @@ if __name__ == '__main__':
     ymin, ymax, yn = -1.25, +1.25, int(2500/2)
     maxiter = 200
     horizon = 2.0 ** 40
-    log_horizon = np.log(np.log(horizon))/np.log(2)
+    log_horizon = np.float32(np.log2(np.log(horizon)))
     Z, N = mandelbrot(xmin, xmax, ymin, ymax, xn, yn, maxiter, horizon)
 
     # Normalized recount as explained in:
     # http://linas.org/art-gallery/escape/smooth.html
-    M = np.nan_to_num(N + 1 - np.log(np.log(abs(Z)))/np.log(2) + log_horizon)
+    # (kept in float32 like Z, N is converted once)
+    M = np.nan_to_num(N.astype(np.float32) + 1 - np.log2(np.log(abs(Z))) + log_horizon)
     
     dpi = 72
     width = 10
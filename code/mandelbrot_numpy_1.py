@@ -13,8 +13,11 @@ def mandelbrot(xmin, xmax, ymin, ymax, xn, yn, maxiter, horizon=2.0):
     C = X + Y[:,None]*1j
     N = np.zeros(C.shape, dtype=int)
     Z = np.zeros(C.shape, np.complex64)
+    # Modulus and mask buffers, allocated once for all iterations
+    M = np.empty(C.shape, np.float32)
+    I = np.empty(C.shape, bool)
     for n in range(maxiter):
-        I = np.less(abs(Z), horizon)
+        np.less(np.abs(Z, out=M), horizon, out=I)
         N[I] = n
         Z[I] = Z[I]**2 + C[I]
     N[N == maxiter-1] = 0
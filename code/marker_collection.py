@@ -22,6 +22,8 @@ class MarkerCollection:
         self._scale = np.ones(n)
         self._translate = np.zeros((n, 2))
         self._rotate = np.zeros(n)
+        self._cos_rotate = np.empty((n, 1))
+        self._sin_rotate = np.empty((n, 1))
         self._path = Path(vertices=self._vertices.reshape(n*len(v), 2),
                           codes=self._codes)
         self._collection = PathCollection(
@@ -42,20 +44,18 @@ class MarkerCollection:
     def update(self):
         n = len(self)
 
-        # Scale
-        self._vertices[...] = self._base_vertices * self._scale
-
-        # Rotation
-        cos_rotate, sin_rotate = np.cos(self._rotate), np.sin(self._rotate)
-        R = np.empty((n, 2, 2))
-        R[:, 0, 0] = cos_rotate
-        R[:, 1, 0] = sin_rotate
-        R[:, 0, 1] = -sin_rotate
-        R[:, 1, 1] = cos_rotate
-        self._vertices[...] = np.einsum('ijk,ilk->ijl', self._vertices, R)
-
-        # Translation
-        self._vertices += self._translate
+        # Rotation, scale & translation (the scale is folded into the 2x2
+        # product and the translation added in the same pass)
+        rotate = np.reshape(self._rotate, (n, 1))
+        cos_rotate = np.cos(rotate, out=self._cos_rotate)
+        sin_rotate = np.sin(rotate, out=self._sin_rotate)
+        scale = np.reshape(self._scale, (-1, 1))
+        cos_rotate *= scale
+        sin_rotate *= scale
+        translate = np.reshape(self._translate, (n, 1, 2))
+        x, y = self._base_vertices[..., 0], self._base_vertices[..., 1]
+        self._vertices[..., 0] = x*cos_rotate - y*sin_rotate + translate[..., 0]
+        self._vertices[..., 1] = x*sin_rotate + y*cos_rotate + translate[..., 1]
 
 fig = plt.figure(figsize=(8, 8))
 ax = plt.subplot(1, 1, 1, aspect=1)
@@ -45,36 +45,51 @@ def build_maze(shape=(65, 65), complexity=0.75, density=0.50):
     P = (P*[shape[1], shape[0]]).astype(int)
     P = 2*(P//2)
 
+    # Flat view on Z: indexing a memoryview is much cheaper than indexing
+    # the numpy array with a tuple at every step of the walk
+    D = memoryview(Z).cast('B')
+    rows, cols = shape
+
+    # Starting points (even cells inside the border) are counted as they
+    # get busy rather than summed before each island
+    busy, busy_total = 0, Z[2:-2:2, 2:-2:2].size
+
     # Create islands
-    for i in range(n_density):
+    for x, y in P.tolist():
 
         # Test for early stop: if all starting point are busy, this means we
         # won't be able to connect any island, so we stop.
-        T = Z[2:-2:2, 2:-2:2]
-        if T.sum() == T.size:
+        if busy == busy_total:
             break
 
-        x, y = P[i]
-        Z[y, x] = 1
+        if D[y*cols+x] == 0:
+            busy += 1
+        D[y*cols+x] = 1
+
+        # Draw all directions at once. 12 being a multiple of 2, 3 and 4,
+        # R[j] % len(neighbours) is uniformly distributed.
+        R = np.random.randint(0, 12, n_complexity).tolist()
         for j in range(n_complexity):
             neighbours = []
             if x > 1:
-                neighbours.append([(y, x-1), (y, x-2)])
-            if x < shape[1]-2:
-                neighbours.append([(y, x+1), (y, x+2)])
+                neighbours.append((0, -1))
+            if x < cols-2:
+                neighbours.append((0, +1))
             if y > 1:
-                neighbours.append([(y-1, x), (y-2, x)])
-            if y < shape[0]-2:
-                neighbours.append([(y+1, x), (y+2, x)])
+                neighbours.append((-1, 0))
+            if y < rows-2:
+                neighbours.append((+1, 0))
             if len(neighbours):
-                choice = np.random.randint(len(neighbours))
-                next_1, next_2 = neighbours[choice]
-                if Z[next_2] == 0:
-                    Z[next_1] = 1
+                dy, dx = neighbours[R[j] % len(neighbours)]
+                next_1 = (y+dy)*cols + x+dx
+                next_2 = (y+2*dy)*cols + x+2*dx
+                if D[next_2] == 0:
+                    busy += 1
+                    D[next_1] = 1
                     yield Z.copy()
-                    Z[next_2] = 1
+                    D[next_2] = 1
                     yield Z.copy()
-                    y, x = next_2
+                    y, x = y+2*dy, x+2*dx
             else:
                 break
     return Z
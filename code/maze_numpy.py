@@ -46,33 +46,48 @@ def build_maze(shape=(65,65), complexity=0.75, density = 0.50):
     P = (P*[shape[1],shape[0]]).astype(int)
     P = 2*(P//2)
     
+    # Flat view on Z: indexing a memoryview is much cheaper than indexing
+    # the numpy array with a tuple at every step of the walk
+    D = memoryview(Z).cast('B')
+    rows, cols = shape
+
+    # Starting points (even cells inside the border) are counted as they
+    # get busy rather than summed before each island
+    busy, busy_total = 0, Z[2:-2:2,2:-2:2].size
+
     # Create islands
-    for i in range(n_density):
+    for x, y in P.tolist():
 
         # Test for early stop: if all starting point are busy, this means we
         # won't be able to connect any island, so we stop.
-        T = Z[2:-2:2,2:-2:2]
-        if T.sum() == T.size:
+        if busy == busy_total:
             break
 
-        x, y = P[i]
-        Z[y,x] = 1
+        if D[y*cols+x] == 0:
+            busy += 1
+        D[y*cols+x] = 1
+
+        # Draw all directions at once. 12 being a multiple of 2, 3 and 4,
+        # R[j] % len(neighbours) is uniformly distributed.
+        R = np.random.randint(0, 12, n_complexity).tolist()
         for j in range(n_complexity):
             neighbours = []
             if x > 1:
-                neighbours.append([(y, x-1), (y, x-2)])
-            if x < shape[1]-2:
-                neighbours.append([(y, x+1), (y, x+2)])
+                neighbours.append((0, -1))
+            if x < cols-2:
+                neighbours.append((0, +1))
             if y > 1:
-                neighbours.append([(y-1, x), (y-2, x)])
-            if y < shape[0]-2:
-                neighbours.append([(y+1, x), (y+2, x)])
+                neighbours.append((-1, 0))
+            if y < rows-2:
+                neighbours.append((+1, 0))
             if len(neighbours):
-                choice = np.random.randint(len(neighbours))
-                next_1, next_2 = neighbours[choice]
-                if Z[next_2] == 0:
-                    Z[next_1] = Z[next_2] = 1
-                    y, x = next_2
+                dy, dx = neighbours[R[j] % len(neighbours)]
+                next_1 = (y+dy)*cols + x+dx
+                next_2 = (y+2*dy)*cols + x+2*dx
+                if D[next_2] == 0:
+                    busy += 1
+                    D[next_1] = D[next_2] = 1
+                    y, x = y+2*dy, x+2*dx
             else:
                 break
     return Z
@@ -104,21 +119,31 @@ def BellmanFord(Z, start, goal):
     # We iterate until value at exit is > 0. This requires the maze
     # to have a solution or it will be stuck in the loop.
 
-    G_gamma = np.empty_like(G)
+    # Double buffering: new gradient is written into G_next (whose border
+    # remains 0) and then swapped with G, no temporary being allocated.
+    Z = Z.astype(G.dtype)
+    G_next = np.zeros_like(G)
     while G[goal] == 0.0:
         # Slow
         # G = Z * generic_filter(G, diffuse, footprint=[[0, 1, 0],
         #                                               [1, 1, 1],
         #                                               [0, 1, 0]])
 
-        # Fast
-        np.multiply(G, gamma, out=G_gamma)
-        N = G_gamma[0:-2,1:-1]
-        W = G_gamma[1:-1,0:-2]
+        # Fast (gamma being positive, max(gamma*N,...,gamma*S) is
+        # gamma*max(N,...,S) such that only the interior is discounted)
+        N = G[0:-2,1:-1]
+        W = G[1:-1,0:-2]
         C = G[1:-1,1:-1]
-        E = G_gamma[1:-1,2:]
-        S = G_gamma[2:,1:-1]
-        G[1:-1,1:-1] = Z[1:-1,1:-1]*np.maximum(N,np.maximum(W,np.maximum(C,np.maximum(E,S))))
+        E = G[1:-1,2:]
+        S = G[2:,1:-1]
+        T = G_next[1:-1,1:-1]
+        np.maximum(N, S, out=T)
+        np.maximum(T, W, out=T)
+        np.maximum(T, E, out=T)
+        np.multiply(T, gamma, out=T)
+        np.maximum(T, C, out=T)
+        np.multiply(T, Z[1:-1,1:-1], out=T)
+        G, G_next = G_next, G
     
     # Descent gradient to find shortest path from entrance to exit
     y, x = goal
@@ -135,7 +160,8 @@ def BellmanFord(Z, start, goal):
             neighbours[2] = G[y-1, x]
         if y < G.shape[0]-1:
             neighbours[3] = G[y+1, x]
-        a = np.argmax(neighbours)
+        # First maximum, as np.argmax, without converting a 4 items list
+        a = max(range(4), key=neighbours.__getitem__)
         x, y  = x + dirs[a][1], y + dirs[a][0]
     P.append((x, y))
     return G, np.array(P)
@@ -169,6 +195,35 @@ def BreadthFirst(maze, start, goal):
             queue.append((p, neighbour))
     return None
 
+def BreadthFirst_fast(maze, start, goal):
+    # The maze is a regular grid: nodes are flat indices, neighbours are
+    # found by offset and parents are stored in a flat list.
+    height, width = maze.shape
+    M = maze.ravel().tolist()
+    start = start[0]*width + start[1]
+    goal = goal[0]*width + goal[1]
+    queue = deque([start])
+    parent = [-1]*(height*width)
+    parent[start] = start
+    while queue:
+        current = queue.popleft()
+        if current == goal:
+            path = [current]
+            while current != start:
+                current = parent[current]
+                path.append(current)
+            return np.array([divmod(node, width) for node in path[::-1]])
+        row, col = divmod(current, width)
+        # West, North, South, East
+        for neighbour, inside in ((current-1, col > 0),
+                                  (current-width, row > 0),
+                                  (current+width, row < height-1),
+                                  (current+1, col < width-1)):
+            if inside and not M[neighbour] and parent[neighbour] < 0:
+                parent[neighbour] = current
+                queue.append(neighbour)
+    return None
+
 
 # -------------------------------------------------------------------- main ---
 if __name__ == '__main__':
@@ -179,7 +234,7 @@ if __name__ == '__main__':
     G, P = BellmanFord(Z, start, goal)
     X, Y = P[:,0], P[:,1]
         
-    # P = BreadthFirst(Z, start, goal)
+    # P = BreadthFirst(Z, start, goal)  # or BreadthFirst_fast
     # X, Y = P[:,1], P[:,0]
     
     # Visualization maze, gradient and shortest path
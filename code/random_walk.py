@@ -37,13 +37,29 @@ def random_walk_faster(n=1000):
     return [0]+list(accumulate(steps))
 
 
+def random_walk_getrandbits(n=1000):
+    from itertools import accumulate
+    # All steps from a single draw of n random bits
+    bits = bin(random.getrandbits(n) | 1 << n)[3:]
+    steps = map({'0': -1, '1': +1}.__getitem__, bits)
+    return [0]+list(accumulate(steps))
+
+
 # --- Vectorized approach -----------------------------------------------------
 def random_walk_fastest(n=1000):
     # No 's' in numpy choice (Python offers choice & choices)
-    steps = np.random.choice([-1,+1], 1000)
+    steps = np.random.choice([-1,+1], n)
     return np.cumsum(steps)
 
 
+def random_walk_bits(n=1000):
+    # A step only needs one random bit: draw bytes and unpack them
+    bits = np.random.randint(0, 256, (n+7)//8, dtype=np.uint8)
+    steps = 2*np.unpackbits(bits, count=n).view(np.int8) - 1
+    # Position is within [-n, +n]: accumulate in the smallest signed type
+    return np.cumsum(steps, dtype=np.min_scalar_type(-(n+1)))
+
+
 # -----------------------------------------------------------------------------
 # Readable but slow
 def find_crossing_1(seq, sub):
@@ -59,6 +75,15 @@ def find_crossing_2(seq, sub):
     mask = np.all((np.take(seq, check) == sub), axis=-1)
     return candidates[mask]
 
+# Fast: one vectorized comparison per item of sub, on shifted views of seq
+def find_crossing_3(seq, sub):
+    seq = np.asarray(seq)
+    n = max(len(seq) - len(sub) + 1, 0)
+    mask = seq[:n] == sub[0]
+    for i in range(1, len(sub)):
+        mask &= seq[i:i+n] == sub[i]
+    return np.nonzero(mask)[0]
+
 
 if __name__ == "__main__":
     from tools import timeit
@@ -68,8 +93,11 @@ if __name__ == "__main__":
     timeit("[position for position in walker.walk(n=10000)]", globals())
     timeit("random_walk(n=10000)", globals())
     timeit("random_walk_faster(n=10000)", globals())
+    timeit("random_walk_getrandbits(n=10000)", globals())
     timeit("random_walk_fastest(n=10000)", globals())
+    timeit("random_walk_bits(n=10000)", globals())
     print()
     W = random_walk_fastest(n=1000)
     timeit("find_crossing_1(list(W), [+1,0,-1])", globals())
     timeit("find_crossing_2(W, [+1,0,-1])", globals())
+    timeit("find_crossing_3(W, [+1,0,-1])", globals())
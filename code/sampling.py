@@ -3,6 +3,7 @@
 # Copyright (2017) Nicolas P. Rougier - BSD license
 # More information at https://github.com/rougier/numpy-book
 # -----------------------------------------------------------------------------
+import random
 import numpy as np
 
 
@@ -12,70 +13,79 @@ def Bridson_sampling(width=1.0, height=1.0, radius=0.025, k=30):
     def squared_distance(p0, p1):
         return (p0[0]-p1[0])**2 + (p0[1]-p1[1])**2
 
-    def random_point_around(p, k=1):
+    def random_offsets(n):
         # WARNING: This is not uniform around p but we can live with it
-        R = np.random.uniform(radius, 2*radius, k)
-        T = np.random.uniform(0, 2*np.pi, k)
-        P = np.empty((k, 2))
-        P[:, 0] = p[0]+R*np.sin(T)
-        P[:, 1] = p[1]+R*np.cos(T)
+        R = np.random.uniform(radius, 2*radius, n)
+        T = np.random.uniform(0, 2*np.pi, n)
+        O = np.empty((n, 2))
+        O[:, 0] = R*np.sin(T)
+        O[:, 1] = R*np.cos(T)
+        return O
+
+    def random_point_around(p, k=1):
+        # Offsets are taken from a pool that is drawn (and refilled) at once
+        nonlocal offsets, index
+        if index+k > len(offsets):
+            offsets, index = random_offsets(1024*k), 0
+        P = p + offsets[index:index+k]
+        index += k
         return P
 
     def in_limits(p):
         return 0 <= p[0] < width and 0 <= p[1] < height
 
-    def neighborhood(shape, index, n=2):
-        row, col = index
-        row0, row1 = max(row-n, 0), min(row+n+1, shape[0])
-        col0, col1 = max(col-n, 0), min(col+n+1, shape[1])
-        I = np.dstack(np.mgrid[row0:row1, col0:col1])
-        I = I.reshape(I.size//2, 2).tolist()
-        I.remove([row, col])
-        return I
-
     def in_neighborhood(p):
         i, j = int(p[0]/cellsize), int(p[1]/cellsize)
-        if M[i, j]:
+        if I[i, j] >= 0:
             return True
-        for (i, j) in N[(i, j)]:
-            if M[i, j] and squared_distance(p, P[i, j]) < squared_radius:
-                return True
+        # Scan the 5x5 window around (i,j), nearest cells first since they
+        # are the most likely to hold a conflicting point
+        for di, dj in window:
+            ii, jj = i+di, j+dj
+            if 0 <= ii < rows and 0 <= jj < cols:
+                n = I[ii, jj]
+                if n >= 0 and squared_distance(p, S[n]) < squared_radius:
+                    return True
         return False
 
     def add_point(p):
         points.append(p)
         i, j = int(p[0]/cellsize), int(p[1]/cellsize)
-        P[i, j], M[i, j] = p, True
+        I[i, j] = len(S)
+        S.append(p)
 
     # Here `2` corresponds to the number of dimension
     cellsize = radius/np.sqrt(2)
     rows = int(np.ceil(width/cellsize))
     cols = int(np.ceil(height/cellsize))
 
+    # Offsets of the 5x5 window (but its center) by increasing distance
+    window = sorted([(di, dj) for di in range(-2, 3) for dj in range(-2, 3)
+                     if di or dj], key=lambda d: d[0]*d[0]+d[1]*d[1])
+
     # Squared radius because we'll compare squared distance
     squared_radius = radius*radius
 
-    # Positions cells
-    P = np.zeros((rows, cols, 2), dtype=np.float32)
-    M = np.zeros((rows, cols), dtype=bool)
+    # Samples (in order of creation) and index of the sample in each cell
+    S = []
+    I = np.full((rows, cols), -1, dtype=np.int32)
 
-    # Cache generation for neighborhood
-    N = {}
-    for i in range(rows):
-        for j in range(cols):
-            N[(i, j)] = neighborhood(M.shape, (i, j), 2)
+    # Pool of candidate offsets
+    offsets, index = random_offsets(1024*k), 0
 
     points = []
-    add_point((np.random.uniform(width), np.random.uniform(height)))
+    add_point((random.random()*width, random.random()*height))
     while len(points):
-        i = np.random.randint(len(points))
+        i = random.randrange(len(points))
         p = points[i]
-        del points[i]
+        # Order does not matter: swap with last and pop in O(1)
+        points[i] = points[-1]
+        points.pop()
         Q = random_point_around(p, k)
-        for q in Q:
+        for q in Q.tolist():
             if in_limits(q) and not in_neighborhood(q):
                 add_point(q)
-    return P[M]
+    return np.array(S, dtype=np.float32)
 
 
 def draw_voronoi(ax, X, Y):
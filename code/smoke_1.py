@@ -35,10 +35,9 @@ def initialization():
     dens_prev[:, :] = 0.0
 
     def disc(shape=(size, size), center=(size/2, size/2), radius=10):
-        def distance(x, y):
-            return np.sqrt((x-center[0])**2+(y-center[1])**2)
-        D = np.fromfunction(distance, shape)
-        return np.where(D <= radius, True, False)
+        X = np.arange(shape[0])[:, np.newaxis] - center[0]
+        Y = np.arange(shape[1])[np.newaxis, :] - center[1]
+        return np.hypot(X, Y) <= radius
 
     D = disc(radius=32) ^ disc(radius=16)
     dens[...] = D*source/10
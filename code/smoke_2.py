@@ -14,6 +14,7 @@ visc = 0.0
 force = 5.0
 source = 100.0
 dvel = False
+seed = None
 
 u = np.zeros((size, size), np.float32)  # velocity
 u_prev = np.zeros((size, size), np.float32)
@@ -24,6 +25,8 @@ v_prev = np.zeros((size, size), np.float32)
 dens = np.zeros((size, size), np.float32)  # density
 dens_prev = np.zeros((size, size), np.float32)
 
+rng = np.random.default_rng(seed)  # velocity noise
+
 
 def initialization():
     global u, v, u_prev, v_prev, dens, dens_prev, size
@@ -36,25 +39,30 @@ def initialization():
     dens_prev[:, :] = 0.0
 
     def disc(shape=(size, size), center=(size/2, size/2), radius=10):
-        def distance(x, y):
-            return np.sqrt((x-center[0])**2+(y-center[1])**2)
-        D = np.fromfunction(distance, shape)
-        return np.where(D <= radius, True, False)
+        X = np.arange(shape[0])[:, np.newaxis] - center[0]
+        Y = np.arange(shape[1])[np.newaxis, :] - center[1]
+        return np.hypot(X, Y) <= radius
 
-    D = disc(radius=10) - disc(radius=5)
+    D = disc(radius=10) ^ disc(radius=5)
     dens[...] += D*source/50
 
-    D = disc(radius=20) - disc(radius=15)
+    D = disc(radius=20) ^ disc(radius=15)
     dens[...] += D*source/50
 
     ox, oy = size/2, size/2
-    for j in range(1, N+1):
-        for i in range(1, N+1):
-            d = np.sqrt((i-ox)**2+(j-oy)**2)
-            u[i, j] = (i-ox)/max(d, 1) * force * 0.25
-            v[i, j] = (j-oy)/max(d, 1) * force * 0.25
-    u[:, :] += force * 0.1 * np.random.uniform(-1, 1, u.shape)
-    v[:, :] += force * 0.1 * np.random.uniform(-1, 1, u.shape)
+    X = np.arange(1, N+1)[:, np.newaxis] - ox
+    Y = np.arange(1, N+1)[np.newaxis, :] - oy
+    D = np.maximum(np.hypot(X, Y), 1)
+    u[1:-1, 1:-1] = X/D * force * 0.25
+    v[1:-1, 1:-1] = Y/D * force * 0.25
+
+    # Uniform noise in [-0.1*force, 0.1*force), drawn directly as float32
+    noise = np.empty_like(u)
+    for Z in (u, v):
+        rng.random(dtype=np.float32, out=noise)
+        noise -= 0.5
+        noise *= 0.2 * force
+        Z += noise
 
 
 def update(*args):
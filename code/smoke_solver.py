@@ -10,10 +10,11 @@ Copyright (c) 2015 Alberto Santini - MIT License
 Code adapted from Alberto Santini implementation available at:
 https://github.com/albertosantini/python-fluid
 """
+import functools
 import numpy as np
 
 
-def set_bnd(N, b, x):
+def set_bnd(N, b, x, corners=True):
     """We assume that the fluid is contained in a box with solid walls.
 
     No flow should exit the walls. This simply means that the horizontal
@@ -21,21 +22,26 @@ def set_bnd(N, b, x):
     vertical component of the velocity should be zero on the horizontal walls.
     For the density and other fields considered in the code we simply assume
     continuity. The following code implements these conditions.
+
+    Corners are only needed once a field is final: they are not read by the
+    relaxation sweeps, which can skip them.
     """
 
     if b == 1:
-        x[0, 1:-1] = -x[1, 1:-1]
-        x[-1, 1:-1] = -x[N, 1:-1]
+        np.negative(x[1, 1:-1], out=x[ 0, 1:-1])
+        np.negative(x[N, 1:-1], out=x[-1, 1:-1])
     else:
         x[ 0, 1:-1] = x[1, 1:-1]
         x[-1, 1:-1] = x[N, 1:-1]
     if b == 2:
-        x[1:-1,  0] = -x[1:-1, 1]
-        x[1:-1, -1] = -x[1:-1, N]
+        np.negative(x[1:-1, 1], out=x[1:-1,  0])
+        np.negative(x[1:-1, N], out=x[1:-1, -1])
     else:
         x[1:-1,  0] = x[1:-1, 1]
         x[1:-1, -1] = x[1:-1, N]
 
+    if not corners:
+        return
     x[ 0,  0] = 0.5 * (x[1,  0] + x[ 0, 1])
     x[ 0, -1] = 0.5 * (x[1, -1] + x[ 0, N])
     x[-1,  0] = 0.5 * (x[N,  0] + x[-1, 1])
@@ -45,11 +51,18 @@ def set_bnd(N, b, x):
 def lin_solve(N, b, x, x0, a, c):
     """lin_solve."""
 
+    if a == 0:
+        # Cells are not coupled (e.g. no diffusion): solution is immediate
+        x[1:-1, 1:-1] = x0[1:-1, 1:-1] / c
+        set_bnd(N, b, x)
+        return
+
     for k in range(20):
         x[1:-1, 1:-1] = (x0[1:-1, 1:-1] +
                          a * (x[:N, 1:-1] + x[2:, 1:-1] +
                               x[1:-1, :N] + x[1:-1, 2:])) / c
-        set_bnd(N, b, x)
+        set_bnd(N, b, x, corners=False)
+    set_bnd(N, b, x)
 
 
 def add_source(N, x, s, dt):
@@ -69,6 +82,17 @@ def diffuse(N, b, x, x0, diff, dt):
     lin_solve(N, b, x, x0, a, 1 + 4 * a)
 
 
+@functools.lru_cache()
+def interior_indices(N, dtype=int):
+    """Indices of the interior cells, computed once for a given N."""
+
+    I, J = np.indices((N, N), dtype=dtype)
+    I += 1
+    J += 1
+    I.flags.writeable = J.flags.writeable = False
+    return I, J
+
+
 def advect(N, b, d, d0, u, v, dt):
     """Advection: the density follows the velocity field.
 
@@ -78,28 +102,32 @@ def advect(N, b, d, d0, u, v, dt):
     time from the cell centers.
     """
 
-    dt0 = dt * N
+    # Everything is computed in the dtype of the fields (float32)
+    dt0 = d.dtype.type(dt * N)
 
-    I, J = np.indices((N, N))
-    I += 1
-    J += 1
-    X = I - dt0 * u[I, J]
-    Y = J - dt0 * v[I, J]
+    I, J = interior_indices(N, d.dtype)
+    X = I - dt0 * u[1:-1, 1:-1]
+    Y = J - dt0 * v[1:-1, 1:-1]
 
-    X = np.minimum(np.maximum(X, 0.5), N+0.5)
+    # Positions are > 0: fractional and integral parts are weights and cells
+    np.clip(X, 0.5, N+0.5, out=X)
+    S1, X = np.modf(X)
     I0 = X.astype(int)
-    I1 = I0+1
-    S1 = X - I0
-    S0 = 1 - S1
 
-    Y = np.minimum(np.maximum(Y, 0.5), N+0.5)
+    np.clip(Y, 0.5, N+0.5, out=Y)
+    T1, Y = np.modf(Y)
     J0 = Y.astype(int)
-    J1 = J0 + 1
-    T1 = Y - J0
-    T0 = 1 - T1
 
-    d[I, J] = (S0 * (T0 * d0[I0, J0] + T1 * d0[I0, J1])
-             + S1 * (T0 * d0[I1, J0] + T1 * d0[I1, J1]))
+    # Gather the four corners through flat indices into d0 and interpolate
+    # linearly along J, then along I
+    K = I0*(N+2) + J0
+    D0 = d0.ravel()
+    D00, D01 = D0.take(K), D0.take(K+1)
+    D10, D11 = D0.take(K+N+2), D0.take(K+N+3)
+    D00 += T1 * (D01 - D00)
+    D10 += T1 * (D11 - D10)
+    D00 += S1 * (D10 - D00)
+    d[1:-1, 1:-1] = D00
 
     set_bnd(N, b, d)
 
@@ -61,40 +61,31 @@ def timeit(stmt, globals):
     
 def info(Z):
     import numpy as np
-        
-    print("------------------------------")
-    print("Interface (item)")
-    print("  shape:      ", Z.shape)
-    print("  dtype:      ", Z.dtype)
-    print("  size:       ", Z.size)
-    if np.isfortran(Z):
-        print("  order:       ☐ C  ☑ Fortran")
-    else:
-        print("  order:       ☑ C  ☐ Fortran")
-    print("")
-    print("Memory (byte)")
-    print("  item size:  ", Z.itemsize)
-    print("  array size: ", Z.size*Z.itemsize)
-    print("  strides:    ", Z.strides)
-    print("")
-    print("Properties")
-    if Z.flags["OWNDATA"]:
-        print("  own data:    ☑ Yes  ☐ No")
-    else:
-        print("  own data:    ☐ Yes  ☑ No")
-    if Z.flags["WRITEABLE"]:
-        print("  writeable:   ☑ Yes  ☐ No")
-    else:
-        print("  writeable:   ☐ Yes  ☑ No")
-    if np.isfortran(Z) and Z.flags["F_CONTIGUOUS"]:
-        print("  contiguous:  ☑ Yes  ☐ No")
-    elif not np.isfortran(Z) and Z.flags["C_CONTIGUOUS"]:
-        print("  contiguous:  ☑ Yes  ☐ No")
-    else:
-        print("  contiguous:  ☐ Yes  ☑ No")
-    if Z.flags["ALIGNED"]:
-        print("  aligned:     ☑ Yes  ☐ No")
-    else:
-        print("  aligned:     ☐ Yes  ☑ No")
-    print("------------------------------")
-    print()
+
+    def check(value, yes="Yes", no="No"):
+        return ("☑ %s  ☐ %s" if value else "☐ %s  ☑ %s") % (yes, no)
+
+    flags = Z.flags
+    fortran = np.isfortran(Z)
+    contiguous = flags["F_CONTIGUOUS"] if fortran else flags["C_CONTIGUOUS"]
+    lines = [
+        "------------------------------",
+        "Interface (item)",
+        "  shape:       %s" % (Z.shape,),
+        "  dtype:       %s" % Z.dtype,
+        "  size:        %s" % Z.size,
+        "  order:       " + ("☐ C  ☑ Fortran" if fortran else "☑ C  ☐ Fortran"),
+        "",
+        "Memory (byte)",
+        "  item size:   %s" % Z.itemsize,
+        "  array size:  %s" % (Z.size*Z.itemsize),
+        "  strides:     %s" % (Z.strides,),
+        "",
+        "Properties",
+        "  own data:    " + check(flags["OWNDATA"]),
+        "  writeable:   " + check(flags["WRITEABLE"]),
+        "  contiguous:  " + check(contiguous),
+        "  aligned:     " + check(flags["ALIGNED"]),
+        "------------------------------",
+        "", ""]
+    print("\n".join(lines), end="")
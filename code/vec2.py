@@ -1,46 +1,71 @@
 import math
-from collections import namedtuple
+from operator import attrgetter
 
 
-def struct(name, members):
-    cls = namedtuple(name, members)
-    cls.__repr__ = lambda self: "%s(%s)" % (name, ','.join(str(s) for s in self))
-    return cls
+class vec2:
+    # Coordinates are stored in private slots and exposed read-only, such
+    # that a vec2 can be hashed by value (like the namedtuple it replaces)
+    __slots__ = ('_x', '_y')
 
+    def __init__(self, x, y):
+        self._x = x
+        self._y = y
 
-class vec2(struct('vec2', ('x', 'y'))):
+    x = property(attrgetter('_x'))
+    y = property(attrgetter('_y'))
+
+    def __repr__(self):
+        return "vec2(%s,%s)" % (self._x, self._y)
+
+    def __len__(self):
+        return 2
+
+    def __getitem__(self, index):
+        return (self._x, self._y)[index]
+
+    def __iter__(self):
+        yield self._x
+        yield self._y
+
+    def __eq__(self, other):
+        if not isinstance(other, (vec2, tuple)):
+            return NotImplemented
+        return tuple(self) == tuple(other)
+
+    def __hash__(self):
+        return hash((self._x, self._y))
 
     def __add__(self, other):
         if isinstance(other, vec2):
-            return vec2(self.x+other.x, self.y+other.y)
-        return vec2(self.x+other, self.y+other)
+            return vec2(self._x+other._x, self._y+other._y)
+        return vec2(self._x+other, self._y+other)
 
     def __sub__(self, other):
         if isinstance(other, vec2):
-            return vec2(self.x-other.x, self.y-other.y)
-        return vec2(self.x-other, self.y-other)
+            return vec2(self._x-other._x, self._y-other._y)
+        return vec2(self._x-other, self._y-other)
 
     def __mul__(self, other):
         if isinstance(other, vec2):
-            return vec2(self.x*other.x, self.y*other.y)
-        return vec2(self.x*other, self.y*other)
+            return vec2(self._x*other._x, self._y*other._y)
+        return vec2(self._x*other, self._y*other)
 
     def __truediv__(self, other):
         if isinstance(other, vec2):
-            return vec2(self.x/other.x, self.y/other.y)
-        return vec2(self.x/other, self.y/other)
+            return vec2(self._x/other._x, self._y/other._y)
+        return vec2(self._x/other, self._y/other)
 
     def length(self):
-        return math.hypot(self.x, self.y)
+        return math.hypot(self._x, self._y)
 
     def normalized(self):
         length = self.length()
         if not length:
             length = 1.0
-        return vec2(self.x/length, self.y/length)
+        return vec2(self._x/length, self._y/length)
 
     def limited(self, maxlength=1.0):
         length = self.length()
         if length > maxlength:
-            return vec2(maxlength*self.x/length, maxlength*self.y/length)
+            return vec2(maxlength*self._x/length, maxlength*self._y/length)
         return self